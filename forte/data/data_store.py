@@ -14,7 +14,7 @@
 from copy import deepcopy
 import json
 import sys
-from typing import Dict, List, Iterator, Set, Tuple, Optional, Any
+from typing import Dict, List, Iterable, Iterator, Tuple, Optional, Any
 
 import uuid
 import logging
@@ -736,7 +736,9 @@ class DataStore(BaseStore):
         return attr_list
 
     def fetch_entry_type_data(
-        self, type_name: str, attributes: Optional[Set[Tuple[str, str]]] = None
+        self,
+        type_name: str,
+        attributes: Optional[Iterable[Tuple[str, str]]] = None,
     ) -> Dict[str, Tuple]:
         r"""This function takes a fully qualified ``type_name`` class name
         and a set of tuples representing an attribute and its required type
@@ -760,7 +762,7 @@ class DataStore(BaseStore):
         Args:
             type_name: A fully qualified name of an entry class.
             attributes: This argument is used when parsing ontology
-                files. The entries in the set are a tuples of two
+                files. It is an iterable (e.g., a set) of tuples of two
                 elements.
 
                 .. code-block:: python
@@ -11,13 +11,15 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import itertools as it
+import functools
 import logging
 import os
+import re
+import sys
 import warnings
 from abc import ABC
 from pathlib import Path
-from typing import Optional, Any, List, Dict, Set, Tuple, cast
+from typing import Optional, Any, Iterator, List, Dict, Sequence, Set, Tuple
 from numpy import ndarray
 
 from forte.data.ontology.code_generation_exceptions import (
@@ -27,7 +29,7 @@ from forte.data.ontology.code_generation_exceptions import (
 from forte.data.ontology.ontology_code_const import (
     SUPPORTED_PRIMITIVES,
     NON_COMPOSITES,
-    COMPOSITES,
+    ALL_INBUILT_TYPES,
     Config,
     get_ignore_error_lines,
     AUTO_GEN_SIGNATURE,
@@ -36,6 +38,37 @@ from forte.data.ontology.ontology_code_const import (
 from forte.data.ontology.utils import split_file_path
 
 
+@functools.lru_cache(maxsize=4096)
+def _last_component(full_name: str) -> str:
+    return full_name.rsplit(".", 1)[-1]
+
+
+ImportStatement = Tuple[Optional[str], str, Optional[str]]
+
+
+def _import_statement_str(
+    module_name: Optional[str], class_name: str, as_name: Optional[str]
+) -> str:
+    statement = (
+        f"import {class_name}"
+        if module_name is None
+        else f"from {module_name} import {class_name}"
+    )
+    return statement if as_name is None else f"{statement} as {as_name}"
+
+
+def _import_statement_key(statement: ImportStatement) -> Tuple:
+    # Sorts the same way as the statement strings: all `from` imports come
+    # before the plain `import`s, the rest follows the name parts.
+    module_name, class_name, as_name = statement
+    return (
+        module_name is None,
+        module_name or "",
+        class_name,
+        as_name or "",
+    )
+
+
 class ImportManager:
     r"""A naive implementation that records import strings and imported names
     to be used. Mainly used to avoid import name conflicts such as:
@@ -48,17 +81,28 @@ class ImportManager:
     ):
         self.__root = root
         self.__module_name = module_name
-        self.__import_statements: List[str] = []
+        # Import statements as (module, class name, alias) tuples, the module
+        # and alias are None when not needed. Kept in a set so that repeated
+        # statements are dropped, the order is only fixed when sorting.
+        self.__import_statements: Set[ImportStatement] = set()
+        # Sorted view of the import statements, reset when a new one is added.
+        self.__sorted_statements: Optional[List[str]] = None
         # Defining names imported by this module.
         self.__imported_names: Dict[str, str] = {}
         # Defining names to be added by this generation module
         self.__defining_names: Dict[str, str] = {}
         self.__short_name_pool: Set[str] = set()
+        # The next suffix to try for each conflicting short name.
+        self.__name_counter: Dict[str, int] = {}
         self.__fix_modules = False
 
     def fix_modules(self):
         self.__fix_modules = True
 
+    @property
+    def is_fixed(self) -> bool:
+        return self.__fix_modules
+
     def is_known_name(self, full_class_name):
         """
         Check whether the class name can be used. It will check the class name
@@ -71,11 +115,13 @@ class ImportManager:
             imported or it is of a primitive type.
 
         """
+        # The cheap local lookups go first, they cover most of the names
+        # (user-defined ones); only then may we walk up to the root.
         return (
-            full_class_name in NON_COMPOSITES
-            or full_class_name in COMPOSITES
+            full_class_name in self.__defining_names
+            or full_class_name in self.__imported_names
+            or full_class_name in ALL_INBUILT_TYPES
             or self.is_imported(full_class_name)
-            or full_class_name in self.__defining_names
         )
 
     def is_imported(self, class_name):
@@ -89,12 +135,15 @@ class ImportManager:
         """
         if class_name in self.__imported_names:
             return True
-        elif self.__root is None:
+        elif self.__root is None or self.__fix_modules:
+            # A fixed module cannot take new imports from the root, so the
+            # local record is the final answer.
             return False
-        else:
-            if self.__root.is_imported(class_name) and not self.__fix_modules:
-                self.add_object_to_import(class_name)
-                return True
+        elif self.__root.is_imported(class_name):
+            # Importing the name here memoizes the root hit for later calls.
+            self.add_object_to_import(class_name)
+            return True
+        return False
 
     def all_stored(self):
         return self.__imported_names.items()
@@ -109,51 +158,46 @@ class ImportManager:
         if self.is_imported(full_name):
             return self.__imported_names[full_name]
 
-    def get_import_statements(self):
-        return sorted(self.__import_statements)
+    def get_import_statements(self) -> List[str]:
+        if self.__sorted_statements is None:
+            self.__sorted_statements = [
+                _import_statement_str(*statement)
+                for statement in sorted(
+                    self.__import_statements, key=_import_statement_key
+                )
+            ]
+        return list(self.__sorted_statements)
 
     def create_import_statement(self, full_name: str, as_name: str):
         if full_name not in NON_COMPOSITES:
-            parts = full_name.split(".")
-            class_name = parts[-1]
-
-            if len(parts) > 1:
-                module_name = ".".join(parts[:-1])
-
-                if (
-                    self.__module_name is None
-                    or not module_name == self.__module_name
-                ):
-                    # No need to import classes in the same module
-                    if class_name == as_name:
-                        import_statement = (
-                            f"from {module_name} " f"import {class_name}"
-                        )
-                    else:
-                        import_statement = (
-                            f"from {module_name} "
-                            f"import {class_name} as {as_name}"
-                        )
-
-                    self.__import_statements.append(import_statement)
-            else:
-                if class_name == as_name:
-                    import_statement = f"import {class_name}"
-                else:
-                    import_statement = f"import {class_name} as {as_name}"
-                self.__import_statements.append(import_statement)
+            module_name, _, class_name = full_name.rpartition(".")
+
+            if module_name and module_name == self.__module_name:
+                # No need to import classes in the same module
+                return
+
+            # The statement text is only built when it is requested, see
+            # `get_import_statements`.
+            self.__import_statements.add(
+                (
+                    module_name if module_name else None,
+                    class_name,
+                    None if class_name == as_name else as_name,
+                )
+            )
+            self.__sorted_statements = None
 
     def __find_next_available(self, class_name) -> str:
-        counter = 0
-        while True:
-            as_name = f"{class_name}_{counter}"
+        counter = self.__name_counter.get(class_name, 0)
+        as_name = f"{class_name}_{counter}"
+        while as_name in self.__short_name_pool:
             counter += 1
-            if as_name not in self.__short_name_pool:
-                break
+            as_name = f"{class_name}_{counter}"
+        self.__name_counter[class_name] = counter + 1
         return as_name
 
     def __assign_as_name(self, full_name) -> str:
-        class_name = full_name.split(".")[-1]
+        class_name = _last_component(full_name)
         if class_name not in self.__short_name_pool:
             self.__short_name_pool.add(class_name)
             return class_name
@@ -170,8 +214,9 @@ class ImportManager:
                 f"more objects."
             )
 
+        full_name = sys.intern(full_name)
         if full_name not in self.__defining_names:
-            class_name = full_name.split(".")[-1]
+            class_name = _last_component(full_name)
             if class_name not in self.__short_name_pool:
                 self.__short_name_pool.add(class_name)
             else:
@@ -182,6 +227,53 @@ class ImportManager:
                 )
             self.__defining_names[full_name] = class_name
 
+    def imports_snapshot(
+        self,
+    ) -> Tuple[Dict[str, str], Set[str], Dict[str, int], Set[ImportStatement]]:
+        """
+        Get a copy of the import records of this manager: the imported names,
+        the short name pool, the suffix counters and the import statements.
+        Changing the copies does not affect this manager.
+        """
+        return (
+            dict(self.__imported_names),
+            set(self.__short_name_pool),
+            dict(self.__name_counter),
+            set(self.__import_statements),
+        )
+
+    def copy_imports_from(self, other: "ImportManager"):
+        """
+        Copy the imports recorded by `other` into this manager, this should
+        only be done on a fresh manager. The result is the same as adding the
+        same objects to import one by one, except for the import statements
+        of this module itself, which are left out.
+
+        Args:
+            other: The manager to copy the imports from.
+        """
+        if self.__fix_modules:
+            raise CodeGenerationException(
+                f"The module [{self.__module_name}] is fixed, cannot add "
+                f"more objects."
+            )
+
+        (
+            imported_names,
+            short_name_pool,
+            name_counter,
+            import_statements,
+        ) = other.imports_snapshot()
+        self.__imported_names.update(imported_names)
+        self.__short_name_pool.update(short_name_pool)
+        self.__name_counter.update(name_counter)
+        self.__import_statements.update(
+            statement
+            for statement in import_statements
+            if statement[0] is None or statement[0] != self.__module_name
+        )
+        self.__sorted_statements = None
+
     def add_object_to_import(self, full_name: str):
         if self.__fix_modules:
             # After fixing the modules, we should not add objects for import.
@@ -190,6 +282,7 @@ class ImportManager:
                 f"more objects."
             )
 
+        full_name = sys.intern(full_name)
         if full_name not in self.__imported_names:
             if full_name not in SUPPORTED_PRIMITIVES:
                 as_name = self.__assign_as_name(full_name)
@@ -208,9 +301,13 @@ class ImportManagerPool:
         self.__root_manager = ImportManager(None, None)
         self.__managers: Dict[str, ImportManager] = {}
         self.__default_imports: List[str] = []
+        # A manager holding only the default imports, to be copied into the
+        # new managers. Built on demand.
+        self.__default_manager: Optional[ImportManager] = None
 
     def add_default_import(self, full_name: str):
         self.__default_imports.append(full_name)
+        self.__default_manager = None
 
     @property
     def root(self) -> ImportManager:
@@ -220,9 +317,13 @@ class ImportManagerPool:
         if module_name in self.__managers:
             return self.__managers[module_name]
         else:
+            if self.__default_manager is None:
+                self.__default_manager = ImportManager(None, None)
+                for full_name in self.__default_imports:
+                    self.__default_manager.add_object_to_import(full_name)
+
             nm = ImportManager(self.__root_manager, module_name)
-            for full_name in self.__default_imports:
-                nm.add_object_to_import(full_name)
+            nm.copy_imports_from(self.__default_manager)
 
             self.__managers[module_name] = nm
             return nm
@@ -233,40 +334,64 @@ class ImportManagerPool:
             im.fix_modules()
 
 
+# Indentation strings of the levels used in practice, computed once.
+_INDENTS: Tuple[str, ...] = tuple(" " * Config.indent * i for i in range(64))
+
+
 def indent(level: int) -> str:
+    if 0 <= level < len(_INDENTS):
+        return _INDENTS[level]
     return " " * Config.indent * level
 
 
 def indent_line(line: str, level: int) -> str:
-    return f"{indent(level)}{line}" if line else ""
+    return indent(level) + line if line else ""
 
 
 def indent_code(
-    code_lines: List[Optional[str]], level: int = 0, is_line_break: bool = True
+    code_lines: Sequence[Optional[str]],
+    level: int = 0,
+    is_line_break: bool = True,
 ) -> str:
-    lines = []
-
-    for code in code_lines:
-        if code is None:
-            continue
-        if code == "":
-            lines.append("")
-        else:
-            lines.extend(
-                code.split(Config.line_break) if code is not None else []
-            )
+    pad = indent(level)
+    lines = (pad + line if line else "" for line in _split_code(code_lines))
     ending = "\n" if is_line_break else ""
-    return (
-        Config.line_break.join([indent_line(line, level) for line in lines])
-        + ending
-    )
+    return Config.line_break.join(lines) + ending
+
+
+# Only these are taken as line breaks, the other characters that
+# `str.splitlines` breaks on (e.g., "\x0c") are kept in the text.
+_LINE_BREAK = re.compile(r"\r\n|\r|\n")
+
+
+def _split_lines(code: str) -> List[str]:
+    # Like `str.split`, an empty string or a trailing line break results in
+    # an empty line.
+    return _LINE_BREAK.split(code)
+
+
+def _split_code(code_lines: Sequence[Optional[str]]) -> List[str]:
+    """
+    Split the code blocks into single lines, skipping the `None` blocks. Any
+    line ending is accepted. An empty block or an empty list results in one
+    empty line.
+    """
+    lines = [
+        line
+        for code in code_lines
+        if code is not None
+        for line in _split_lines(code)
+    ]
+    return lines if lines else [""]
 
 
 class EntryName:
     def __init__(self, entry_name: str):
-        entry_splits = entry_name.split(".")
+        # Only the last two parts are needed separately, the rest is the
+        # package.
+        entry_splits = entry_name.rsplit(".", 2)
         self.filename, self.name = entry_splits[-2:]
-        self.pkg = ".".join(entry_splits[0:-2])
+        self.pkg = entry_splits[0] if len(entry_splits) == 3 else ""
         self.pkg_dir = self.pkg.replace(".", "/")
         self.module_name: str = f"{self.pkg}.{self.filename}"
         self.class_name: str = entry_name
@@ -303,31 +428,43 @@ class Property(Item, ABC):
         self.default_val = default_val
         self.import_manager: ImportManager = import_manager
         self.import_manager.add_object_to_import(self.type_str)
+        self._resolved_type_str: Optional[str] = None
 
     def to_declaration(self, level: int):
-        s = f"{self.field_name}: {self.internal_type_str()}"
+        s = f"{self.field_name}: {self.resolved_type_str()}"
         return indent_line(s, level)
 
     def internal_type_str(self) -> str:
         raise NotImplementedError
 
+    def resolved_type_str(self) -> str:
+        """
+        The result of `internal_type_str`, which is memoized once the import
+        manager is fixed since the names to use cannot change after that.
+        """
+        if self._resolved_type_str is not None:
+            return self._resolved_type_str
+        type_str = self.internal_type_str()
+        if self.import_manager.is_fixed:
+            self._resolved_type_str = type_str
+        return type_str
+
     def default_value(self) -> str:
         raise NotImplementedError
 
     def to_init_code(self, level: int) -> str:
         return indent_line(
             f"self.{self.field_name}: "
-            f"{self.internal_type_str()} = "
+            f"{self.resolved_type_str()} = "
             f"{self.default_value()}",
             level,
         )
 
     def to_description(self, level: int) -> Optional[str]:
-        desc = f"{self.field_name} ({self.internal_type_str()}):"
+        desc = f"{self.field_name} ({self.resolved_type_str()}):"
 
         if self.description is not None and self.description.strip() != "":
             desc += f"\t{self.description}"
-            return indent_line(desc, level)
         return indent_line(desc, level)
 
     def to_field_value(self):
@@ -413,8 +550,7 @@ class NdArrayProperty(Property):
         self.ndarray_shape: Optional[List[int]] = ndarray_shape
 
     def internal_type_str(self) -> str:
-        type_str = self.import_manager.get_name_to_use(self.type_str)
-        return f"{type_str}"
+        return self._full_class()
 
     def default_value(self) -> str:
         if self.ndarray_dtype is None:
@@ -467,8 +603,7 @@ class DictProperty(Property):
         self.self_ref: bool = self_ref
 
     def internal_type_str(self) -> str:
-        # option_type = self.import_manager.get_name_to_use('typing.Optional')
-        return f"{self._full_class()}"
+        return self._full_class()
 
     def default_value(self) -> str:
         if self.type_str == "typing.Dict":
@@ -516,8 +651,7 @@ class ListProperty(Property):
         self.self_ref: bool = self_ref
 
     def internal_type_str(self) -> str:
-        # option_type = self.import_manager.get_name_to_use('typing.Optional')
-        return f"{self._full_class()}"
+        return self._full_class()
 
     def default_value(self) -> str:
         if self.type_str == "typing.List":
@@ -537,6 +671,10 @@ class ListProperty(Property):
         return self.name
 
 
+# The lines opening every generated class, before the class statement.
+_CLASS_PREAMBLE: Tuple[str, ...] = ("", "", "@dataclass")
+
+
 class EntryDefinition(Item):
     def __init__(
         self,
@@ -558,79 +696,122 @@ class EntryDefinition(Item):
         self.description = description if description else None
         self.init_args = init_args if init_args is not None else ""
         self.init_args = self.init_args.replace("=", " = ")
+        # The argument names passed on to the parent's __init__.
+        self._super_args: str = ", ".join(
+            arg.split(":", 1)[0].strip()
+            for arg in self.init_args.split(",")
+            if arg.strip()
+        )
+        # The head of the __init__ method only depends on the arguments, so
+        # it is rendered once, relative to the class statement.
+        self._init_head: Tuple[str, str] = (
+            self.to_init_code(1),
+            indent_line(f"super().__init__({self._super_args})", 2),
+        )
 
     def to_init_code(self, level: int) -> str:
         return indent_line(f"def __init__(self, {self.init_args}):", level)
 
     def to_property_code(self, level: int) -> str:
-        lines = []
-        for p in self.properties:
-            lines.append(p.to_declaration(0))
-        return indent_code(
-            [indent_line(line, 0) for line in lines], level, False
-        )
+        lines = [p.to_declaration(0) for p in self.properties]
+        return indent_code(lines, level, False)
 
     def to_class_attribute_code(self, level: int):
         lines = [item.to_code(0) for item in self.class_attributes]
-        return indent_code(
-            [indent_line(line, 0) for line in lines], level, False
-        )
+        return indent_code(lines, level, False)
 
-    def to_code(self, level: int) -> str:
-        super_args = ", ".join(
-            [item.split(":")[0].strip() for item in self.init_args.split(",")]
-        )
-        raw_desc = self.to_description(1)
-        desc: str = "" if raw_desc is None else raw_desc
-        lines: List[Optional[str]] = [
-            "",
-            "",
-            "@dataclass",
-            f"class {self.name}({self.class_type}):",
-        ]
+    def _emit_lines(self) -> Iterator[str]:
+        """
+        Yield the lines of the class definition one by one, indented relative
+        to the class statement. The lines do not carry the line breaks.
+        """
+        yield from _CLASS_PREAMBLE
+        yield f"class {self.name}({self.class_type}):"
 
-        lines += [desc] if desc.strip() else []
+        for line, sub_level in self._description_lines():
+            yield indent_line(line, 1 + sub_level)
 
-        lines.append("")
+        yield ""
 
-        property_code = self.to_property_code(1)
-        if property_code:
-            lines.append(property_code)
-            lines.append("")
+        if self.properties:
+            for p in self.properties:
+                yield p.to_declaration(1)
+            yield ""
 
-        class_attr_code = self.to_class_attribute_code(1)
-        if class_attr_code:
-            lines.append(class_attr_code)
-            lines.append("")
+        if self.class_attributes:
+            for item in self.class_attributes:
+                yield item.to_code(1)
+            yield ""
 
-        lines += [
-            self.to_init_code(1),
-            indent_line(f"super().__init__({super_args})", 2),
-        ]
-        lines += [item.to_init_code(2) for item in self.properties]
-        lines += [""]
+        yield from self._init_head
+        for p in self.properties:
+            yield p.to_init_code(2)
 
-        return indent_code(lines, level, False)
+    def iter_lines(self, level: int) -> Iterator[str]:
+        """
+        Yield the lines of the class definition indented to `level`, without
+        the line breaks.
+
+        Args:
+            level: The indentation level of the class statement.
+        """
+        pad = indent(level)
+        for line in self._emit_lines():
+            yield pad + line if line else ""
+
+    def to_code(self, level: int) -> str:
+        line_break = Config.line_break
+        return "".join(line + line_break for line in self.iter_lines(level))
+
+    @staticmethod
+    def to_item_descs(items, title) -> List[str]:
+        return [
+            indent_line(line, sub_level)
+            for line, sub_level in EntryDefinition._item_desc_lines(
+                items, title
+            )
+        ]
 
     @staticmethod
-    def to_item_descs(items, title):
+    def _item_desc_lines(items, title) -> List[Tuple[str, int]]:
+        """
+        Get the description lines of `items` under `title`, as pairs of the
+        line and its indentation level relative to the title.
+        """
         item_descs = [item.to_description(0) for item in items]
         item_descs = [item for item in item_descs if item is not None]
-        if len(item_descs) > 0:
-            item_descs = [indent_line(title, 0)] + [
-                indent_line(desc, 1) for desc in item_descs
-            ]
-        return item_descs
+        if len(item_descs) == 0:
+            return []
+
+        lines = [(title, 0)]
+        for desc in item_descs:
+            first_line, *other_lines = _split_lines(desc)
+            lines.append((first_line, 1))
+            # The following lines of a multi-line description stay at the
+            # level of the title.
+            lines.extend((line, 0) for line in other_lines)
+        return lines
+
+    def _description_lines(self) -> List[Tuple[str, int]]:
+        """
+        Get the docstring lines of this class as pairs of the line and its
+        indentation level relative to the docstring quotes.
+        """
+        lines: List[Tuple[str, int]] = []
+        if self.description is not None:
+            lines.extend((line, 0) for line in _split_lines(self.description))
+        lines.extend(self._item_desc_lines(self.properties, "Attributes:"))
 
-    def to_description(self, level: int) -> Optional[str]:
-        class_desc = [] if self.description is None else [self.description + ""]
-        item_descs = self.to_item_descs(self.properties, "Attributes:")
+        if len(lines) == 0:
+            return lines
+        quotes = ('"""', 0)
+        return [quotes] + lines + [quotes]
 
-        descs = class_desc + item_descs
-        if len(descs) == 0:
-            return ""
-        quotes = indent_line('"""', 0)
-        return indent_code([quotes] + descs + [quotes], level, False)
+    def to_description(self, level: int) -> Optional[str]:
+        return Config.line_break.join(
+            indent_line(line, level + sub_level)
+            for line, sub_level in self._description_lines()
+        )
 
 
 class ModuleWriter:
@@ -638,10 +819,21 @@ class ModuleWriter:
     A writer to write entry definitions to a file.
     """
 
-    def __init__(self, module_name: str, import_managers: ImportManagerPool):
+    def __init__(
+        self,
+        module_name: str,
+        import_managers: ImportManagerPool,
+        prepared_dirs: Optional[Set[str]] = None,
+    ):
         self.module_name = module_name
         self.source_file: Path
 
+        # Directories already set up by `make_module_dirs`, which can be
+        # shared among the writers of the same generation.
+        self.prepared_dirs: Set[str] = (
+            set() if prepared_dirs is None else prepared_dirs
+        )
+
         self.description: Optional[str] = None
         self.import_managers: ImportManagerPool = import_managers
         self.entries: List[Tuple[EntryName, EntryDefinition]] = []
@@ -685,14 +877,18 @@ class ModuleWriter:
         """
         entry_dir_split = split_file_path(self.pkg_dir)
 
-        rel_dir_paths = it.accumulate(entry_dir_split, os.path.join)
-        count = 1
-        for rel_dir_path in rel_dir_paths:
-            temp_path = os.path.join(tempdir, rel_dir_path)
-            if not os.path.exists(temp_path):
-                os.mkdir(temp_path)
+        # Extend both paths by one directory level per step instead of
+        # re-joining the whole relative path each time.
+        temp_path, dest_path = tempdir, destination
+        for count, dir_name in enumerate(entry_dir_split, start=1):
+            temp_path = os.path.join(temp_path, dir_name)
+            dest_path = os.path.join(dest_path, dir_name)
+            if temp_path in self.prepared_dirs:
+                # Created by another module in the same package.
+                continue
+            os.makedirs(temp_path, exist_ok=True)
+            self.prepared_dirs.add(temp_path)
 
-            dest_path = os.path.join(destination, rel_dir_path)
             dest_path_exists = os.path.exists(dest_path)
             if not dest_path_exists:
                 Path(os.path.join(temp_path, AUTO_GEN_FILENAME)).touch()
@@ -705,7 +901,6 @@ class ModuleWriter:
                         init_file_path, "w", encoding="utf-8"
                     ) as init_file:
                         init_file.write(f"# {AUTO_GEN_SIGNATURE}\n")
-            count += 1
 
     def write(
         self,
@@ -736,55 +931,63 @@ class ModuleWriter:
         self.make_module_dirs(tempdir, destination, namespace_depth)
         full_path = os.path.join(tempdir, self.pkg_dir, self.file_name) + ".py"
 
+        line_break = Config.line_break
+        log_entries = logging.getLogger().isEnabledFor(logging.INFO)
         with open(full_path, "w", encoding="utf-8") as f:
             # Write header.
             f.write(self.to_header(0))
+            # Stream the entries line by line, so that the code of a whole
+            # entry never needs to be held in memory at once.
             for entry_name, entry_item in self.entries:
-                logging.info("Writing class: %s", entry_name.class_name)
-                f.write(entry_item.to_code(0))
+                if log_entries:
+                    logging.info("Writing class: %s", entry_name.class_name)
+                f.writelines(
+                    line + line_break for line in entry_item.iter_lines(0)
+                )
 
-    def to_header(self, level: int) -> str:
-        all_first_line = indent_line("__all__ = [", 0)
-        all_mid_lines = indent_code(
-            [f'"{en.name}",' for en, ei in self.entries], 1, False
+    def _emit_header_lines(self) -> Iterator[str]:
+        """
+        Yield the lines of the module header one by one: the description, the
+        imports and the `__all__` list, each block followed by a blank line.
+        """
+        quotes = '"""'
+        # The ignore lines are single lines, only the description may need to
+        # be split.
+        yield from get_ignore_error_lines(str(self.source_file))
+        yield from _split_code([quotes, self.description, quotes])
+        yield ""
+
+        yield from _split_code(
+            self.import_managers.get(self.module_name).get_import_statements()
         )
-        all_last_line = indent_line("]", 0)
-
-        lines = [
-            self.to_description(0),
-            self.to_import_code(0),
-            all_first_line,
-            all_mid_lines,
-            all_last_line,
-        ]
-        return indent_code(lines, level)
+        yield ""
 
-    def to_description(self, level):
-        quotes = '"""'
-        lines = get_ignore_error_lines(str(self.source_file)) + [
-            quotes,
-            self.description,
-            quotes,
-        ]
-        return indent_code(lines, level)
+        yield "__all__ = ["
+        for line in _split_code([f'"{en.name}",' for en, _ in self.entries]):
+            yield indent_line(line, 1)
+        yield "]"
 
-    def to_import_code(self, level):
-        return indent_code(
-            self.import_managers.get(self.module_name).get_import_statements(),
-            level,
+    def to_header(self, level: int) -> str:
+        pad = indent(level)
+        lines = (
+            pad + line if line else "" for line in self._emit_header_lines()
         )
+        return Config.line_break.join(lines) + "\n"
 
 
 class ModuleWriterPool:
     def __init__(self, import_managers: ImportManagerPool):
         self.__module_writers: Dict[str, ModuleWriter] = {}
         self.__import_managers = import_managers
+        self.__prepared_dirs: Set[str] = set()
 
     def get(self, module_name: str) -> ModuleWriter:
         if module_name in self.__module_writers:
             return self.__module_writers[module_name]
         else:
-            mw = ModuleWriter(module_name, self.__import_managers)
+            mw = ModuleWriter(
+                module_name, self.__import_managers, self.__prepared_dirs
+            )
             self.__module_writers[module_name] = mw
             return mw
 
@@ -797,7 +1000,9 @@ class EntryTreeNode:
         self.__children: List[EntryTreeNode] = []
         self.__parent: Optional[EntryTreeNode] = None
         self.name: str = name
-        self.attributes: Set[Tuple[str, str]] = set()
+        # The (name, type) pairs of the attributes, in the order they are
+        # defined; the values are unused.
+        self.attributes: Dict[Tuple[str, str], None] = {}
 
     def __repr__(self):
         r"""for printing purpose."""
@@ -819,6 +1024,16 @@ class EntryTreeNode:
         self.__parent = value
 
 
+def _parse_attributes(
+    attributes: List[List[str]],
+) -> Dict[Tuple[str, str], None]:
+    # Attribute names and types repeat across entries, interning them lets
+    # the nodes share the same strings.
+    return {
+        (sys.intern(attr[0]), sys.intern(attr[1])): None for attr in attributes
+    }
+
+
 class EntryTree:
     r"""
     A tree structure based on the parent-children relations of the entries.
@@ -826,12 +1041,18 @@ class EntryTree:
 
     def __init__(self):
         self.root = EntryTreeNode("root")
+        # Map from the entry name to its node, used to locate nodes without
+        # walking the whole tree.
+        self._index: Dict[str, EntryTreeNode] = {self.root.name: self.root}
+        # Map from the entry name to its ancestors below the root. Nodes are
+        # never re-parented once added, so the chains stay valid.
+        self._parent_chain_cache: Dict[str, List[EntryTreeNode]] = {}
 
     def add_node(
         self,
         curr_entry_name: str,
         parent_entry_name: str,
-        curr_entry_attr: Set[Tuple[str, str]],
+        curr_entry_attr: Dict[Tuple[str, str], None],
     ):
         r"""Add a tree node with `curr_entry_name` as a child to
         `parent_entry_name` in the tree, the attributes `curr_entry_attr`
@@ -846,13 +1067,15 @@ class EntryTree:
         Returns:
 
         """
-        found_node = search(self.root, curr_entry_name)
+        found_node = self._index.get(curr_entry_name)
         if found_node is None:
             curr_entry_node = EntryTreeNode(curr_entry_name)
             curr_entry_node.attributes = curr_entry_attr
-            parent_in_tree = search(self.root, parent_entry_name)
+            self._index[curr_entry_name] = curr_entry_node
+            parent_in_tree = self._index.get(parent_entry_name)
             if parent_in_tree is None:
                 parent_in_tree = EntryTreeNode(parent_entry_name)
+                self._index[parent_entry_name] = parent_in_tree
                 self.root.children.append(parent_in_tree)
                 parent_in_tree.parent = self.root
             parent_in_tree.children.append(curr_entry_node)
@@ -860,6 +1083,17 @@ class EntryTree:
         else:
             found_node.attributes = curr_entry_attr
 
+    def search(self, search_node_name: str) -> Optional[EntryTreeNode]:
+        r"""Find the tree node with the type name `search_node_name`.
+
+        Args:
+            search_node_name: the type name of the node to be found.
+
+        Returns:
+            The node with the name, or None if it is not in the tree.
+        """
+        return self._index.get(search_node_name)
+
     def collect_parents(self, node_dict: Dict[str, Set[str]]):
         r"""Collect all the parent nodes for all the nodes in the `node_dict`
         and add the types and attributes of these parent nodes to `node_dict`.
@@ -871,15 +1105,29 @@ class EntryTree:
                 the type information of the nodes.
 
         """
-        input_node_dict = node_dict.copy()
-        for node_name in input_node_dict.keys():
-            found_node = search(self.root, search_node_name=node_name)
-            if found_node is not None:
-                while found_node.parent.name != "root":
-                    node_dict[found_node.parent.name] = set(
-                        val[0] for val in found_node.parent.attributes
-                    )
-                    found_node = found_node.parent
+        for node_name in list(node_dict.keys()):
+            for parent in self._parent_chain(node_name):
+                node_dict[parent.name] = set(
+                    val[0] for val in parent.attributes
+                )
+
+    def _parent_chain(self, node_name: str) -> List[EntryTreeNode]:
+        r"""Get the ancestors of the node named `node_name`, from the closest
+        one up to (but excluding) the root. Returns an empty list if the node
+        is not in the tree.
+        """
+        chain = self._parent_chain_cache.get(node_name)
+        if chain is None:
+            found_node = self._index.get(node_name)
+            if found_node is None:
+                return []
+            chain = []
+            parent = found_node.parent
+            while parent.name != "root":
+                chain.append(parent)
+                parent = parent.parent
+            self._parent_chain_cache[node_name] = chain
+        return chain
 
     def todict(self) -> Dict[str, Any]:
         r"""Dump the EntryTree structure to a dictionary.
@@ -888,20 +1136,27 @@ class EntryTree:
             dict: A dictionary storing the EntryTree.
         """
 
-        def node_to_dict(node: EntryTreeNode):
-            return (
-                None
-                if not node
-                else {
-                    "name": node.name,
-                    "attributes": list(node.attributes),
-                    "children": [
-                        node_to_dict(child) for child in node.children
-                    ],
-                }
+        root_dict: Dict[str, Any] = {}
+        # Walk the tree in pre-order with an explicit stack, each node is
+        # paired with the children list of its parent's dictionary.
+        stack: List[Tuple[EntryTreeNode, Optional[List]]] = [(self.root, None)]
+        while stack:
+            node, siblings = stack.pop()
+            node_dict: Dict[str, Any] = {
+                "name": node.name,
+                "attributes": list(node.attributes),
+                "children": [],
+            }
+            if siblings is None:
+                root_dict = node_dict
+            else:
+                siblings.append(node_dict)
+            stack.extend(
+                (child, node_dict["children"])
+                for child in reversed(node.children)
             )
 
-        return node_to_dict(self.root)
+        return root_dict
 
     def fromdict(
         self, tree_dict: Dict[str, Any], parent_entry_name: Optional[str] = None
@@ -916,42 +1171,64 @@ class EntryTree:
         if not tree_dict:
             return None
 
+        # Pairs of the node dictionary to be added and its parent name, the
+        # nodes are added in pre-order with an explicit stack.
+        stack: List[Tuple[Dict[str, Any], str]] = []
         if parent_entry_name is None:
             self.root = EntryTreeNode(name=tree_dict["name"])
-            self.root.attributes = set(
-                cast(Tuple[str, str], tuple(attr))
-                for attr in tree_dict["attributes"]
+            self.root.attributes = _parse_attributes(tree_dict["attributes"])
+            self._index = {self.root.name: self.root}
+            self._parent_chain_cache = {}
+            stack.extend(
+                (child, tree_dict["name"])
+                for child in reversed(tree_dict["children"])
             )
         else:
+            stack.append((tree_dict, parent_entry_name))
+
+        while stack:
+            node_dict, parent_name = stack.pop()
+            if not node_dict:
+                continue
             self.add_node(
-                curr_entry_name=tree_dict["name"],
-                parent_entry_name=parent_entry_name,
-                curr_entry_attr=set(
-                    cast(Tuple[str, str], tuple(attr))
-                    for attr in tree_dict["attributes"]
-                ),
+                curr_entry_name=node_dict["name"],
+                parent_entry_name=parent_name,
+                curr_entry_attr=_parse_attributes(node_dict["attributes"]),
+            )
+            stack.extend(
+                (child, node_dict["name"])
+                for child in reversed(node_dict["children"])
             )
-        for child in tree_dict["children"]:
-            self.fromdict(child, tree_dict["name"])
         return self
 
 
 def search(node: EntryTreeNode, search_node_name: str):
-    if node.name == search_node_name:
-        return node
-
-    for child in node.children:
-        tmp = search(child, search_node_name)
-        if tmp:
-            return tmp
+    # Searching from a bare node cannot use the name index, use
+    # `EntryTree.search` when the tree is available. This is a depth-first
+    # walk with an explicit stack, in the same order as a recursive pre-order
+    # traversal.
+    stack = [node]
+    while stack:
+        curr = stack.pop()
+        if curr.name == search_node_name:
+            return curr
+        stack.extend(reversed(curr.children))
+    return None
 
 
 def traverse(node: EntryTreeNode, path: List[str]):
-    path.append(repr(node))
-    if len(node.children) == 0:
-        print(path)
-        path.pop()
-    else:
-        for child in node.children:
-            traverse(child, path)
-        path.pop()
+    # The path is truncated to the depth of each popped node instead of
+    # popping on the way back up, the given prefix is kept as is.
+    base = len(path)
+    stack: List[Tuple[EntryTreeNode, int]] = [(node, base)]
+    while stack:
+        curr, depth = stack.pop()
+        del path[depth:]
+        path.append(repr(curr))
+        if len(curr.children) == 0:
+            print(path)
+        else:
+            stack.extend(
+                (child, depth + 1) for child in reversed(curr.children)
+            )
+    del path[base:]
@@ -1,5 +1,5 @@
 import os
-from typing import List, Set
+from typing import Dict, FrozenSet, List, Set, Tuple
 
 from string import Template
 
@@ -66,25 +66,33 @@ SOURCE_JSON_PFX = "***source json:"
 SOURCE_JSON_SFX = "***"
 SOURCE_JSON_TEMP = Template(f"{SOURCE_JSON_PFX}$file_path{SOURCE_JSON_SFX}")
 
+# The lines after the source json line that do not depend on the file.
+IGNORE_ERRORS_LINES: Tuple[str, ...] = (
+    "# flake8: noqa",
+    "# mypy: ignore-errors",
+    "# pylint: skip-file",
+)
+
 
 def get_ignore_error_lines(json_filepath: str) -> List[str]:
     source_json_sign = SOURCE_JSON_TEMP.substitute(file_path=json_filepath)
     return [
         f"# {AUTO_GEN_SIGNATURE}",
         f"# {source_json_sign}",
-        "# flake8: noqa",
-        "# mypy: ignore-errors",
-        "# pylint: skip-file",
+        *IGNORE_ERRORS_LINES,
     ]
 
 
 DEFAULT_PREFIX = "ft.onto"
 
-SUPPORTED_PRIMITIVES = {"int", "float", "str", "bool"}
-NON_COMPOSITES = {key: key for key in SUPPORTED_PRIMITIVES}
-COMPOSITES = {"List", "Dict", "NdArray"}
+SUPPORTED_PRIMITIVES: FrozenSet[str] = frozenset(
+    {"int", "float", "str", "bool"}
+)
+NON_COMPOSITES: Dict[str, str] = {key: key for key in SUPPORTED_PRIMITIVES}
+COMPOSITES: FrozenSet[str] = frozenset({"List", "Dict", "NdArray"})
 
-ALL_INBUILT_TYPES = set(list(NON_COMPOSITES.keys()) + list(COMPOSITES))
+# The keys of NON_COMPOSITES are the supported primitives.
+ALL_INBUILT_TYPES: FrozenSet[str] = SUPPORTED_PRIMITIVES | COMPOSITES
 
 
 def file_header(desc_str, ontology_name):
@@ -101,8 +109,12 @@ def class_name(clazz):
     return ".".join((clazz.__module__, clazz.__name__))
 
 
-SINGLE_PACK_CLASSES = [class_name(clazz) for clazz in top.SinglePackEntries]
-MULTI_PACK_CLASSES = [class_name(clazz) for clazz in top.MultiPackEntries]
+SINGLE_PACK_CLASSES: FrozenSet[str] = frozenset(
+    class_name(clazz) for clazz in top.SinglePackEntries
+)
+MULTI_PACK_CLASSES: FrozenSet[str] = frozenset(
+    class_name(clazz) for clazz in top.MultiPackEntries
+)
 
 major_version, minor_version = utils.get_python_version()
 if major_version >= 3 and minor_version >= 7:
@@ -114,14 +126,19 @@ else:
     PACK_TYPE_CLASS_NAME = "forte.data.base_pack.PackType"
 
 
+# Map from the entry class name to the pack type it works with, the single
+# pack classes take precedence.
+_PACK_MAP: Dict[str, str] = dict.fromkeys(
+    MULTI_PACK_CLASSES, "forte.data.multi_pack.MultiPack"
+)
+_PACK_MAP.update(
+    dict.fromkeys(SINGLE_PACK_CLASSES, "forte.data.data_pack.DataPack")
+)
+
+
 def hardcoded_pack_map(clazz):
-    if clazz in SINGLE_PACK_CLASSES:
-        return "forte.data.data_pack.DataPack"
-    elif clazz in MULTI_PACK_CLASSES:
-        return "forte.data.multi_pack.MultiPack"
-    else:
-        # When not found, return the default.
-        return PACK_TYPE_CLASS_NAME
+    # When not found, return the default.
+    return _PACK_MAP.get(clazz, PACK_TYPE_CLASS_NAME)
 
 
 class Config:
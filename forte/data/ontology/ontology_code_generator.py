@@ -318,10 +318,11 @@ class OntologyCodeGenerator:
         # Adjacency list to store the allowed types (in-built or user-defined),
         # and their attributes (if any) in order to validate the attribute
         # types.
-        self.allowed_types_tree: Dict[str, Set] = {}
+        # The attributes are kept in the order they are defined.
+        self.allowed_types_tree: Dict[str, Dict[Tuple[str, str], None]] = {}
 
         for type_str in ALL_INBUILT_TYPES:
-            self.allowed_types_tree[type_str] = set()
+            self.allowed_types_tree[type_str] = {}
 
         # self.installed_forte_dir = utils.get_installed_forte_dir()
 
@@ -818,7 +819,7 @@ class OntologyCodeGenerator:
                     f"ontology, will be overridden.",
                     DuplicateEntriesWarning,
                 )
-            self.allowed_types_tree[raw_entry_name] = set()
+            self.allowed_types_tree[raw_entry_name] = {}
 
             # Add the entry definition to the import managers.
             # This time adding to the root manager so everyone can access it
@@ -865,7 +866,7 @@ class OntologyCodeGenerator:
                         f"the ontology, will be overridden",
                         DuplicatedAttributesWarning,
                     )
-                self.allowed_types_tree[en.class_name].add(property_)
+                self.allowed_types_tree[en.class_name][property_] = None
             # populate the entry tree based on information
             if merged_entry_tree is not None:
                 curr_entry_name = en.class_name
@@ -247,10 +247,12 @@ def get_python_version() -> Tuple[int, int]:
 
 
 def get_generated_files_in_dir(path):
+    signature = f"# {AUTO_GEN_SIGNATURE}\n"
+
     def is_generated(file_path):
+        # Only the first line carries the signature.
         with open(file_path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-            return len(lines) > 0 and lines[0] == f"# {AUTO_GEN_SIGNATURE}\n"
+            return f.readline() == signature
 
     ext_files = []
     for root, _, files in os.walk(path):
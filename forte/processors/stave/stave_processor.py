@@ -32,7 +32,6 @@ from forte.utils import create_import_error_msg
 from forte.common import Resources, ProcessorConfigError
 from forte.common.configuration import Config
 from forte.data.data_pack import DataPack
-from forte.data.ontology.code_generation_objects import search
 from forte.processors.base import PackProcessor
 
 try:
@@ -229,7 +228,7 @@ class StaveProcessor(PackProcessor):
         # Find all subclass of `forte.data.ontology.top.Annotation` and
         # update `scopeConfigs` accordingly.
         queue = collections.deque(
-            [search(entry_tree.root, "forte.data.ontology.top.Annotation")]
+            [entry_tree.search("forte.data.ontology.top.Annotation")]
         )
         while queue:
             size = len(queue)
@@ -209,7 +209,7 @@ class AdvancedPipelineTest(unittest.TestCase):
         Test if two `EntryTreeNode` objects are recursively equivalent
         """
         self.assertEqual(root1.name, root2.name)
-        self.assertSetEqual(root1.attributes, root2.attributes)
+        self.assertEqual(root1.attributes, root2.attributes)
         self.assertEqual(len(root1.children), len(root2.children))
         for i in range(len(root1.children)):
             self._assertEntryTreeEqual(root1.children[i], root2.children[i])
@@ -15,11 +15,14 @@
     Tests for the module forte.data.ontology.ontology_code_generator
 """
 import importlib
+import json
 import os
+import shutil
 import sys
 import tempfile
 import unittest
 import warnings
+from pathlib import Path
 from string import Template
 
 import jsonschema
@@ -39,43 +42,60 @@ from forte.data.ontology.code_generation_exceptions import (
     InvalidIdentifierException,
     CodeGenerationException,
 )
-from forte.data.ontology.code_generation_objects import ImportManager
+from forte.data.ontology.code_generation_objects import (
+    EntryDefinition,
+    EntryTree,
+    ImportManager,
+    ImportManagerPool,
+    NonCompositeProperty,
+    indent_code,
+    search,
+)
+from forte.data.ontology.ontology_code_const import Config
 from forte.data.ontology.ontology_code_generator import OntologyCodeGenerator
 
 
 @ddt
 class GenerateOntologyTest(unittest.TestCase):
-    def setUp(self):
-        self.generator = OntologyCodeGenerator()
-        self.dir_path = None
-
+    @classmethod
+    def setUpClass(cls):
         curr_dir = os.path.dirname(__file__)
 
-        self.spec_dir = os.path.join(curr_dir, "test_specs/")
-        self.test_output = os.path.join(curr_dir, "test_outputs/")
+        cls.spec_dir = os.path.join(curr_dir, "test_specs/")
+        cls.test_output = os.path.join(curr_dir, "test_outputs/")
 
-    def tearDown(self):
+        # The directories generated by the test cases, to be cleaned up once
+        # all of them are done.
+        cls._dirs_to_cleanup = []
+
+    @classmethod
+    def tearDownClass(cls):
         """
-        Cleans up the generated files after test case if any. Only cleans up if
-        generate_ontology passes successfully.
+        Cleans up the generated files of the test cases if any. Only the
+        directories of the cases where generate_ontology passes successfully
+        are registered.
         """
-        if self.dir_path is not None:
-            self.generator.cleanup_generated_ontology(
-                self.dir_path, is_forced=True
-            )
+        generator = OntologyCodeGenerator()
+        for dir_path in cls._dirs_to_cleanup:
+            generator.cleanup_generated_ontology(dir_path, is_forced=True)
+
+    def setUp(self):
+        # The generator keeps the state of the specs it has generated, so
+        # each test needs its own one.
+        self.generator = OntologyCodeGenerator()
 
     def assert_generation_equal(self, file_a, file_b):
-        with open(file_a, "r") as a, open(file_b, "r") as b:
-            lines_a = a.readlines()
-            lines_b = b.readlines()
-            self.assertEqual(len(lines_a), len(lines_b))
-            for la, lb in zip(lines_a, lines_b):
-                # Skip source path line.
-                if la.startswith("# ***source json:") and lb.startswith(
-                    "# ***source json:"
-                ):
-                    continue
-                self.assertEqual(la, lb)
+        # Compare the raw bytes, there is no need to decode the files.
+        lines_a = Path(file_a).read_bytes().splitlines(keepends=True)
+        lines_b = Path(file_b).read_bytes().splitlines(keepends=True)
+        self.assertEqual(len(lines_a), len(lines_b))
+        for la, lb in zip(lines_a, lines_b):
+            # Skip source path line.
+            if la.startswith(b"# ***source json:") and lb.startswith(
+                b"# ***source json:"
+            ):
+                continue
+            self.assertEqual(la, lb)
 
 
     @data(
@@ -104,7 +124,7 @@ class GenerateOntologyTest(unittest.TestCase):
             folder_path = self.generator.generate(
                 json_file_path, tempdir, is_dry_run=True
             )
-            self.dir_path = folder_path
+            self._dirs_to_cleanup.append(folder_path)
 
             # Reorder code.
             generated_files = sorted(
@@ -262,6 +282,133 @@ class GenerateOntologyTest(unittest.TestCase):
 
         self.assertListEqual(imports, expected_imports)
 
+    def test_import_name_conflicts(self):
+        manager = ImportManager(None, "ft.onto.sample")
+        # A defined class occupying one of the suffixed names.
+        manager.add_defining_objects("ft.onto.sample.Token_1")
+
+        modules = ["a", "b", "c", "d"]
+        for module in modules:
+            manager.add_object_to_import(f"{module}.Token")
+
+        self.assertListEqual(
+            [manager.get_name_to_use(f"{m}.Token") for m in modules],
+            ["Token", "Token_0", "Token_2", "Token_3"],
+        )
+        self.assertListEqual(
+            manager.get_import_statements(),
+            [
+                "from a import Token",
+                "from b import Token as Token_0",
+                "from c import Token as Token_2",
+                "from d import Token as Token_3",
+            ],
+        )
+
+        # Repeated statements are only written once.
+        manager.create_import_statement("a.Token", "Token")
+        self.assertEqual(len(manager.get_import_statements()), 4)
+
+    def test_default_imports(self):
+        pool = ImportManagerPool()
+        pool.add_default_import("dataclasses.dataclass")
+        pool.add_default_import("ft.onto.sample.Token")
+
+        for module_name in ("ft.onto.sample", "ft.onto.other"):
+            manager = pool.get(module_name)
+            self.assertTrue(manager.is_imported("ft.onto.sample.Token"))
+            self.assertEqual(
+                manager.get_name_to_use("dataclasses.dataclass"), "dataclass"
+            )
+
+        # Classes of the module itself are not imported there.
+        self.assertListEqual(
+            pool.get("ft.onto.sample").get_import_statements(),
+            ["from dataclasses import dataclass"],
+        )
+        self.assertListEqual(
+            pool.get("ft.onto.other").get_import_statements(),
+            [
+                "from dataclasses import dataclass",
+                "from ft.onto.sample import Token",
+            ],
+        )
+
+        # The snapshot is a copy, changing it does not affect the manager.
+        manager = pool.get("ft.onto.other")
+        imported_names, _, _, statements = manager.imports_snapshot()
+        imported_names.clear()
+        statements.clear()
+        self.assertTrue(manager.is_imported("ft.onto.sample.Token"))
+        self.assertEqual(len(manager.get_import_statements()), 2)
+
+    def test_entry_tree_search(self):
+        json_file_path = os.path.join(self.spec_dir, "base_ontology.json")
+        with open(json_file_path, "r") as f:
+            onto_dict = json.load(f)
+        entry_tree = EntryTree()
+        self.generator.parse_schema_for_no_import_onto_specs_file(
+            json_file_path, onto_dict, merged_entry_tree=entry_tree
+        )
+
+        for name in (
+            "forte.data.ontology.top.Annotation",
+            "ft.onto.base_ontology.Token",
+            "ft.onto.base_ontology.Dependency",
+        ):
+            node = entry_tree.search(name)
+            self.assertIsNotNone(node)
+            self.assertIs(node, search(entry_tree.root, name))
+        self.assertIsNone(entry_tree.search("ft.onto.base_ontology.Unknown"))
+
+        record = {"ft.onto.base_ontology.Token": set()}
+        entry_tree.collect_parents(record)
+        self.assertIn("forte.data.ontology.top.Annotation", record)
+        self.assertNotIn("root", record)
+
+    def test_indent_code(self):
+        line_break = Config.line_break
+        for code in ("a\nb", "a\r\nb", f"a{line_break}b"):
+            self.assertEqual(
+                indent_code([code], 1, False), f"    a{line_break}    b"
+            )
+        # The empty line after a trailing line break is kept.
+        self.assertEqual(
+            indent_code(["a\n", None], 1), f"    a{line_break}\n"
+        )
+        self.assertEqual(indent_code([], 1), "\n")
+        # Only "\r\n", "\r" and "\n" break the lines, the other characters
+        # are kept in the text.
+        self.assertEqual(
+            indent_code(["e\x0c", "f\u2028g"], 1, False),
+            f"    e\x0c{line_break}    f\u2028g",
+        )
+
+    def test_description_line_endings(self):
+        manager = ImportManager(None, "ft.onto.sample")
+        prop = NonCompositeProperty(
+            manager, "field", "str", description="attr line1\r\nattr line2"
+        )
+        entry = EntryDefinition(
+            "Sample",
+            "Annotation",
+            properties=[prop],
+            description="class line1\r\nclass line2",
+        )
+        manager.fix_modules()
+
+        code = entry.to_code(0).replace(Config.line_break, "\n")
+        self.assertNotIn("\r", code)
+        lines = code.split("\n")
+        for line in ("    class line1", "    class line2", "    attr line2"):
+            self.assertIn(line, lines)
+
+        # The description of the entry is the whole class docstring.
+        desc_lines = entry.to_description(1).split(Config.line_break)
+        self.assertEqual(desc_lines[0], '    """')
+        self.assertIn("    Attributes:", desc_lines)
+        self.assertEqual(desc_lines[-1], '    """')
+
     @data(
         "example_ontology.json",
         "example_import_ontology.json",
@@ -382,11 +529,8 @@ class GenerateOntologyTest(unittest.TestCase):
 
 
 def _get_temp_filename(json_file_path, temp_dir):
-    with open(json_file_path, "r") as f:
-        json_content = f.read()
     temp_filename = os.path.join(temp_dir, "temp.json")
-    with open(temp_filename, "w") as temp_file:
-        temp_file.write(json_content)
+    shutil.copyfile(json_file_path, temp_filename)
     return temp_filename
 
 